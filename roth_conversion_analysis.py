@@ -13,11 +13,21 @@ annual_spending_need = 100_000
 investment_return = 0.07
 inflation_rate = 0.03
 
+# Long-term capital gains rates for MFJ (2026 estimated):
+# 0% up to ~$94,050, 15% up to ~$583,750, 20% above
+# For simplicity, use 15% rate (most will fall in this bracket)
+capital_gains_rate = 0.15
+
 chris_ss_annual = 3_500 * 12
 mandy_ss_annual = 2_000 * 12
 ss_start_age_chris = 67
 ss_start_age_mandy = 67
 
+# Social Security taxation thresholds on provisional income (MFJ): up to 50% of
+# benefits are taxable above the first, up to 85% above the second
+ss_threshold1 = 32_000
+ss_threshold2 = 44_000
+
 # 2026 Tax brackets (MFJ) - assuming TCJA provisions extended or similar
 # Standard deduction for 65+ in 2026 (estimated)
 standard_deduction_2026 = 32_300  # Base + age 65+ addition
@@ -33,357 +43,581 @@ tax_brackets_2026 = [
     (731_200, float('inf'), 0.37)
 ]
 
+# Medicare premiums and IRMAA surcharges (2026 estimated, MFJ)
+# Standard Part B premium ~$174.70/month in 2024, assume $185/month in 2026
+base_part_b = 185 * 12
+# Standard Part D premium varies, use ~$35/month average
+base_part_d = 35 * 12
+# Surcharge tiers by MAGI: tier k applies above irmaa_magi_thresholds[k - 1]
+irmaa_magi_thresholds = np.array([206_000, 258_000, 322_000, 386_000, 750_000], dtype=np.float64)
+irmaa_part_b_multipliers = np.array([0.0, 0.40, 1.00, 1.60, 2.20, 2.40])
+irmaa_part_d_surcharges = np.array([0.0, 12.90, 33.30, 53.80, 74.20, 81.00]) * 12
+
+# Default Roth conversion target: fill taxable income to the top of the 24% bracket
+conversion_target_income = 383_900
+
 # RMD divisors (Uniform Lifetime Table)
 rmd_table = {
     73: 26.5, 74: 25.5, 75: 24.6, 76: 23.7, 77: 22.9, 78: 22.0, 79: 21.1,
     80: 20.2, 81: 19.4, 82: 18.5, 83: 17.7, 84: 16.8, 85: 16.0, 86: 15.2,
     87: 14.4, 88: 13.7, 89: 12.9, 90: 12.2, 91: 11.5, 92: 10.8, 93: 10.1,
-    94: 9.5, 95: 8.9
+    94: 9.5, 95: 8.9, 96: 8.4, 97: 7.8, 98: 7.3, 99: 6.8, 100: 6.4,
+    101: 6.0, 102: 5.6, 103: 5.2, 104: 4.9, 105: 4.6, 106: 4.3, 107: 4.1,
+    108: 3.9, 109: 3.7, 110: 3.5, 111: 3.4, 112: 3.3, 113: 3.1, 114: 3.0,
+    115: 2.9, 116: 2.8, 117: 2.7, 118: 2.5, 119: 2.3, 120: 2.0
 }
 
-def calculate_federal_tax(taxable_income, brackets):
-    """Calculate federal income tax"""
-    tax = 0
-    for i, (lower, upper, rate) in enumerate(brackets):
-        if taxable_income > lower:
-            taxable_in_bracket = min(taxable_income, upper) - lower
-            tax += taxable_in_bracket * rate
-        if taxable_income <= upper:
-            break
-    return tax
+# Dense age-indexed RMD rates (1 / divisor); zero before RMDs start, so the
+# RMD is a plain multiply. Ages past the table keep the age-120 divisor.
+RMD_RATES = np.zeros(200)
+for age, divisor in rmd_table.items():
+    RMD_RATES[age] = 1 / divisor
+RMD_RATES[max(rmd_table) + 1:] = 1 / rmd_table[max(rmd_table)]
+
+# Simulation output columns; the core writes one row of `out` per column
+OUTPUT_COLUMNS = [
+    'Trad_IRA_Begin', 'Roth_IRA_Begin', 'Taxable_Begin', 'Social_Security', 'RMD',
+    'Spending_Need', 'Roth_Conversion', 'Additional_Withdrawal', 'Taxable_SS',
+    'Taxable_Income', 'Federal_Tax', 'IRMAA_Premium', 'Total_IRA_Distribution',
+    'Trad_IRA_Growth', 'Trad_IRA_End', 'Roth_Distribution', 'Roth_IRA_Growth',
+    'Roth_IRA_End', 'Net_Available', 'Surplus_Deficit', 'Taxable_Growth',
+    'Taxable_Cap_Gains_Tax', 'Taxable_Contribution', 'Taxable_Withdrawal',
+    'Taxable_End', 'Total_Assets_End'
+]
+(TRAD_IRA_BEGIN, ROTH_IRA_BEGIN, TAXABLE_BEGIN, SOCIAL_SECURITY,
+ RMD, SPENDING_NEED, ROTH_CONVERSION, ADDITIONAL_WITHDRAWAL,
+ TAXABLE_SS, TAXABLE_INCOME, FEDERAL_TAX, IRMAA_PREMIUM,
+ TOTAL_IRA_DISTRIBUTION, TRAD_IRA_GROWTH, TRAD_IRA_END, ROTH_DISTRIBUTION,
+ ROTH_IRA_GROWTH, ROTH_IRA_END, NET_AVAILABLE, SURPLUS_DEFICIT,
+ TAXABLE_GROWTH, TAXABLE_CAP_GAINS_TAX, TAXABLE_CONTRIBUTION, TAXABLE_WITHDRAWAL,
+ TAXABLE_END, TOTAL_ASSETS_END) = range(len(OUTPUT_COLUMNS))
+
+# Scenario-years at which run_scenarios switches to the numba-compiled core (if numba is
+# installed). The plain loop costs ~55us per scenario-year; numba's import and cache load
+# cost ~0.5s up front, so it only wins past roughly 9,000 scenario-years.
+numba_min_scenario_years = 10_000
+numba_compiled = False
+
+# Bracket table as arrays: lower edge, marginal rate, and tax owed at each lower edge
+bracket_lowers = np.array([lower for lower, upper, rate in tax_brackets_2026], dtype=np.float64)
+bracket_rates = np.array([rate for lower, upper, rate in tax_brackets_2026], dtype=np.float64)
+bracket_base_tax = np.concatenate(([0.0], np.cumsum(np.diff(bracket_lowers) * bracket_rates[:-1])))
+
+def calculate_federal_tax(taxable_income):
+    """Calculate federal income tax (scalar or array of taxable incomes)"""
+    taxable_income = np.maximum(taxable_income, 0)
+    idx = np.searchsorted(bracket_lowers, taxable_income, side='right') - 1
+    return bracket_base_tax[idx] + (taxable_income - bracket_lowers[idx]) * bracket_rates[idx]
 
 def calculate_ss_taxable(ss_benefit, agi):
-    """Calculate taxable portion of Social Security"""
+    """Calculate taxable portion of Social Security (scalar or array inputs)"""
+    provisional_income = agi + (ss_benefit * 0.5)
+    
+    # 50% of provisional income between the thresholds (at most half the benefit),
+    # plus 85% of the excess over ss_threshold2, capped at 85% of the benefit
+    between_thresholds = np.minimum(np.maximum(provisional_income - ss_threshold1, 0.0), ss_threshold2 - ss_threshold1)
+    tier1 = np.minimum(between_thresholds * 0.5, ss_benefit * 0.5)
+    tier2 = np.maximum(provisional_income - ss_threshold2, 0.0) * 0.85
+    return np.minimum(ss_benefit * 0.85, tier1 + tier2)
+
+def calculate_irmaa(magi):
+    """Annual Part B + Part D premium per person, including any IRMAA surcharge"""
+    tier = np.searchsorted(irmaa_magi_thresholds, magi, side='left')
+    return (base_part_b * (1 + irmaa_part_b_multipliers[tier])
+            + base_part_d + irmaa_part_d_surcharges[tier])
+
+def marginal_rate(taxable_income):
+    """Marginal federal rate at a given taxable income (0 below the standard deduction)"""
+    if taxable_income <= 0:
+        return 0.0
+    return bracket_rates[np.searchsorted(bracket_lowers, taxable_income, side='right') - 1]
+
+def tax_on_agi(agi, total_ss, std_deduction):
+    """Taxable SS, taxable income and federal tax for a given AGI"""
+    taxable_ss = calculate_ss_taxable(total_ss, agi)
+    taxable_income = max(0.0, agi + taxable_ss - std_deduction)
+    federal_tax = calculate_federal_tax(taxable_income)
+    return taxable_ss, taxable_income, federal_tax
+
+def ss_taxable_slope(ss_benefit, agi):
+    """Rate at which taxable Social Security grows per extra dollar of AGI"""
     if ss_benefit == 0:
-        return 0
+        return 0.0
     
     provisional_income = agi + (ss_benefit * 0.5)
     
-    # MFJ thresholds
-    threshold1 = 32_000
-    threshold2 = 44_000
-    
-    if provisional_income <= threshold1:
-        return 0
-    elif provisional_income <= threshold2:
-        return min(ss_benefit * 0.5, (provisional_income - threshold1) * 0.5)
+    if provisional_income <= ss_threshold1:
+        return 0.0
+    elif provisional_income <= ss_threshold2:
+        # 50% tier until half the benefit is taxable
+        return 0.5 if (provisional_income - ss_threshold1) * 0.5 < ss_benefit * 0.5 else 0.0
     else:
-        amount1 = min(ss_benefit * 0.5, (threshold2 - threshold1) * 0.5)
-        amount2 = min(ss_benefit * 0.85 - amount1, (provisional_income - threshold2) * 0.85)
-        return amount1 + amount2
-
-def run_scenario(scenario_name, do_conversions=False):
-    """Run retirement scenario with or without Roth conversions"""
-    
-    results = []
-    
-    # Initialize balances
-    trad_ira = initial_ira
-    roth_ira = 0
-    taxable_account = 0
-    
-    year = 2026
-    chris_age = chris_age_2026
-    mandy_age = mandy_age_2026
-    
-    while chris_age <= chris_life_expectancy or mandy_age <= mandy_life_expectancy:
-        year_data = {
-            'Year': year,
-            'Chris_Age': chris_age,
-            'Mandy_Age': mandy_age,
-            'Scenario': scenario_name
-        }
-        
-        # Determine if still alive
-        chris_alive = chris_age <= chris_life_expectancy
-        mandy_alive = mandy_age <= mandy_life_expectancy
-        both_alive = chris_alive and mandy_alive
-        
-        # Beginning balances
-        year_data['Trad_IRA_Begin'] = trad_ira
-        year_data['Roth_IRA_Begin'] = roth_ira
-        year_data['Taxable_Begin'] = taxable_account
-        
-        # Social Security
-        chris_ss = chris_ss_annual if chris_age >= ss_start_age_chris and chris_alive else 0
-        mandy_ss = mandy_ss_annual if mandy_age >= ss_start_age_mandy and mandy_alive else 0
-        total_ss = chris_ss + mandy_ss
-        year_data['Social_Security'] = total_ss
-        
-        # RMD calculation
-        rmd_age = max(chris_age if chris_alive else 0, mandy_age if mandy_alive else 0)
-        if rmd_age >= 73 and trad_ira > 0:
-            rmd = trad_ira / rmd_table.get(rmd_age, 8.9)
-        else:
-            rmd = 0
-        year_data['RMD'] = rmd
-        
-        # Spending need (inflated) - calculate this early as it's needed for conversion sizing
-        years_since_2026 = year - 2026
-        spending_need = annual_spending_need * ((1 + inflation_rate) ** years_since_2026)
-        year_data['Spending_Need'] = spending_need
+        # 85% tier until 85% of the benefit is taxable
+        amount1 = min(ss_benefit * 0.5, (ss_threshold2 - ss_threshold1) * 0.5)
+        return 0.85 if (provisional_income - ss_threshold2) * 0.85 < ss_benefit * 0.85 - amount1 else 0.0
+
+def _simulate_core(do_conversions, conversion_targets, conversion_plans, chris_ages, medicare_count,
+                   std_deductions, ss_total, rmd_rates, spending, out):
+    """Year-by-year balance rollforward for each scenario; fills out[scenario, column, year] in place"""
+    n_years = len(chris_ages)
+    n_scenarios = len(do_conversions)
+    
+    for s in range(n_scenarios):
+        # Initialize balances
+        trad_ira = float(initial_ira)
+        roth_ira = 0.0
+        taxable_account = 0.0
         
-        # Roth conversion
-        conversion = 0
-        if do_conversions and chris_age < 73:  # Convert before RMDs start
-            # Calculate max we can withdraw to stay at top of 24% bracket
-            std_deduction = standard_deduction_2026 if both_alive else standard_deduction_2026 * 0.7
-            top_of_24_bracket = 383_900
+        for t in range(n_years):
+            chris_age = chris_ages[t]
+            total_ss = ss_total[t]
+            spending_need = spending[t]
+            std_deduction = std_deductions[t]
             
-            # Work backwards from taxable income to total withdrawal
-            # Taxable income = AGI + Taxable SS - Std Deduction
-            # We want: Taxable income = 383,900
-            # So: AGI + Taxable SS = 383,900 + 32,300 = 416,200
+            # Beginning balances
+            out[s, TRAD_IRA_BEGIN, t] = trad_ira
+            out[s, ROTH_IRA_BEGIN, t] = roth_ira
+            out[s, TAXABLE_BEGIN, t] = taxable_account
+            out[s, SOCIAL_SECURITY, t] = total_ss
             
-            # For simplicity, ignore taxable SS for now (it's 0 until age 67 anyway)
-            # AGI = Total Withdrawal (RMD + Conversion + Additional)
-            target_agi = top_of_24_bracket + std_deduction
+            # RMD calculation
+            rmd = max(trad_ira, 0.0) * rmd_rates[t]
+            out[s, RMD, t] = rmd
+            out[s, SPENDING_NEED, t] = spending_need
             
-            # Calculate tax on this AGI
-            taxable_ss = calculate_ss_taxable(total_ss, target_agi)
-            taxable_income = max(0, target_agi + taxable_ss - std_deduction)
-            tax_at_max = calculate_federal_tax(taxable_income, tax_brackets_2026)
+            # Roth conversion
+            conversion = 0
+            if not np.isnan(conversion_plans[s, t]):
+                # Fixed schedule (e.g. from optimize_conversions), capped at the balance
+                conversion = max(0.0, min(conversion_plans[s, t], trad_ira))
+            elif do_conversions[s] and chris_age < 73:  # Convert before RMDs start
+                # Calculate max we can withdraw to stay at the top of the target bracket
+                target_taxable_income = conversion_targets[s]
+                
+                # Work backwards from taxable income to total withdrawal
+                # Taxable income = AGI + Taxable SS - Std Deduction
+                # We want: Taxable income = target (e.g. 383,900 for the top of 24%)
+                # So: AGI + Taxable SS = 383,900 + 32,300 = 416,200
+                
+                # For simplicity, ignore taxable SS for now (it's 0 until age 67 anyway)
+                # AGI = Total Withdrawal (RMD + Conversion + Additional)
+                target_agi = target_taxable_income + std_deduction
+                
+                # Calculate tax on this AGI
+                taxable_ss, taxable_income, tax_at_max = tax_on_agi(target_agi, total_ss, std_deduction)
+                
+                # Total cash needed = spending + tax
+                total_cash_needed = spending_need + tax_at_max
+                
+                # Cash available from other sources
+                cash_from_other = total_ss + rmd
+                
+                # Additional withdrawal needed for spending/taxes
+                additional_for_spending = max(0, total_cash_needed - cash_from_other)
+                
+                # Total withdrawal = RMD + Additional + Conversion
+                # We want total withdrawal = target_agi
+                # So: Conversion = target_agi - RMD - Additional
+                max_conversion = target_agi - rmd - additional_for_spending
+                
+                # Can't convert more than we have
+                conversion = min(max_conversion, trad_ira)
+                conversion = max(0, conversion)
             
-            # Total cash needed = spending + tax
-            total_cash_needed = spending_need + tax_at_max
+            out[s, ROTH_CONVERSION, t] = conversion
             
-            # Cash available from other sources
-            cash_from_other = total_ss + rmd
+            # Solve for the additional withdrawal that covers spending plus the tax it creates.
+            # Tax is affine in the withdrawal as long as it stays inside one tax bracket and
+            # one SS-taxability tier, with slope m * (1 + ss_slope); solving that line gives
+            # the fixed point directly. Another solve is only needed when the answer lands in
+            # a different bracket or tier, so the line steps alone finish within the number of
+            # segments. The root stays bracketed by [low, high]; a step that would leave the
+            # bracket (possible where the SS cap bends the tax curve down) bisects instead, and
+            # bisection can need more steps than the loop allows. The loop limit is only a guard:
+            # if it is reached, tax is re-evaluated at the final withdrawal so the stored year
+            # stays consistent, and any remaining shortfall shows up in Surplus_Deficit.
+            additional_withdrawal = 0.0
+            low = 0.0
+            high = np.inf
+            for step in range(len(bracket_rates) + 4):
+                agi = rmd + conversion + additional_withdrawal
+                taxable_ss, taxable_income, federal_tax = tax_on_agi(agi, total_ss, std_deduction)
+                shortfall = spending_need + federal_tax - total_ss - rmd - additional_withdrawal
+                if abs(shortfall) < 0.01 or (additional_withdrawal == 0 and shortfall <= 0):
+                    break
+                if shortfall > 0:
+                    low = additional_withdrawal
+                else:
+                    high = additional_withdrawal
+                tax_slope = marginal_rate(taxable_income) * (1 + ss_taxable_slope(total_ss, agi))
+                additional_withdrawal = additional_withdrawal + shortfall / (1 - tax_slope)
+                if not low < additional_withdrawal < high:
+                    additional_withdrawal = 0.5 * (low + high)
+            else:
+                agi = rmd + conversion + additional_withdrawal
+                taxable_ss, taxable_income, federal_tax = tax_on_agi(agi, total_ss, std_deduction)
             
-            # Additional withdrawal needed for spending/taxes
-            additional_for_spending = max(0, total_cash_needed - cash_from_other)
+            # Store final values
+            out[s, ADDITIONAL_WITHDRAWAL, t] = additional_withdrawal
+            out[s, TAXABLE_SS, t] = taxable_ss
+            out[s, TAXABLE_INCOME, t] = taxable_income
+            out[s, FEDERAL_TAX, t] = federal_tax
             
-            # Total withdrawal = RMD + Additional + Conversion
-            # We want total withdrawal = target_agi
-            # So: Conversion = target_agi - RMD - Additional
-            max_conversion = target_agi - rmd - additional_for_spending
+            # Medicare IRMAA calculation (Income Related Monthly Adjustment Amount)
+            # Applies to ages 65+ for Part B and Part D
+            # Based on MAGI from 2 years prior (but we'll use current year for simplicity)
+            magi = rmd + conversion + additional_withdrawal  # AGI for IRMAA purposes
+            irmaa_premium = calculate_irmaa(magi) * medicare_count[t]
             
-            # Can't convert more than we have
-            conversion = min(max_conversion, trad_ira)
-            conversion = max(0, conversion)
-        
-        year_data['Roth_Conversion'] = conversion
-        
-        # Total withdrawals from traditional IRA (will be recalculated with additional)
-        
-        # Standard deduction
-        std_deduction = standard_deduction_2026 if both_alive else standard_deduction_2026 * 0.7
-        
-        # Now we need to solve for additional withdrawal iteratively
-        # because additional withdrawal increases AGI, which increases tax, which increases withdrawal needed
-        # Start with initial estimate based on conversion + RMD
-        additional_withdrawal = 0
-        
-        for iteration in range(10):  # Should converge quickly
-            # Total traditional IRA withdrawal
-            total_trad_withdrawal = rmd + conversion + additional_withdrawal
+            out[s, IRMAA_PREMIUM, t] = irmaa_premium
             
-            # AGI calculation
-            agi = total_trad_withdrawal
-            taxable_ss = calculate_ss_taxable(total_ss, agi)
+            # Total IRA distribution
+            # Before Traditional IRA is depleted: all comes from Traditional
+            # After Traditional IRA is depleted: comes from Roth
+            total_ira_distribution = rmd + conversion + additional_withdrawal
+            out[s, TOTAL_IRA_DISTRIBUTION, t] = total_ira_distribution
             
-            # Taxable income
-            taxable_income = max(0, agi + taxable_ss - std_deduction)
+            # Update balances
+            # Traditional IRA: grows first, then distributions taken
+            trad_ira_growth = trad_ira * investment_return
+            trad_ira_after_growth = trad_ira * (1 + investment_return)
             
-            # Federal tax
-            federal_tax = calculate_federal_tax(taxable_income, tax_brackets_2026)
+            # Check if we have enough in Traditional IRA for all distributions
+            if trad_ira_after_growth >= total_ira_distribution:
+                # All distributions come from Traditional
+                trad_ira = trad_ira_after_growth - total_ira_distribution
+                roth_distribution = 0
+            else:
+                # Traditional IRA gets depleted, remainder comes from Roth
+                trad_distribution = trad_ira_after_growth
+                roth_distribution = total_ira_distribution - trad_ira_after_growth
+                trad_ira = 0
             
-            # Cash needs: Spending + Tax
-            # Cash sources: SS + RMD + Additional (conversion goes to Roth, not available for spending)
-            total_cash_needed = spending_need + federal_tax
-            cash_from_ss_and_rmd = total_ss + rmd
+            # Roth IRA: add conversions, grow, then subtract any distributions
+            roth_ira_growth = (roth_ira + conversion) * investment_return
+            roth_ira = (roth_ira + conversion) * (1 + investment_return) - roth_distribution
             
-            # Calculate new additional withdrawal needed
-            new_additional = max(0, total_cash_needed - cash_from_ss_and_rmd)
+            out[s, TRAD_IRA_GROWTH, t] = trad_ira_growth
+            out[s, TRAD_IRA_END, t] = trad_ira
+            out[s, ROTH_DISTRIBUTION, t] = roth_distribution
+            out[s, ROTH_IRA_GROWTH, t] = roth_ira_growth
+            out[s, ROTH_IRA_END, t] = roth_ira
             
-            # Check convergence
-            if abs(new_additional - additional_withdrawal) < 1:
-                additional_withdrawal = new_additional
-                break
+            # Calculate surplus/deficit
+            # Cash available = SS + RMD + Additional (conversion goes to Roth, not spendable)
+            # Cash needed = Spending + Tax
+            cash_available = total_ss + rmd + additional_withdrawal
+            cash_needed = spending_need + federal_tax
+            surplus_or_deficit = cash_available - cash_needed
             
-            additional_withdrawal = new_additional
-        
-        # Store final values
-        year_data['Additional_Withdrawal'] = additional_withdrawal
-        year_data['Taxable_SS'] = taxable_ss
-        year_data['Taxable_Income'] = taxable_income
-        year_data['Federal_Tax'] = federal_tax
-        
-        # Medicare IRMAA calculation (Income Related Monthly Adjustment Amount)
-        # Applies to ages 65+ for Part B and Part D
-        # Based on MAGI from 2 years prior (but we'll use current year for simplicity)
-        # 2026 IRMAA brackets for MFJ (estimated):
-        irmaa_premium = 0
-        
-        if chris_alive and chris_age >= 65:
-            # Standard Part B premium ~$174.70/month in 2024, assume $185/month in 2026
-            base_part_b = 185 * 12
-            # Standard Part D premium varies, use ~$35/month average
-            base_part_d = 35 * 12
+            out[s, NET_AVAILABLE, t] = cash_available
+            out[s, SURPLUS_DEFICIT, t] = surplus_or_deficit
             
-            # IRMAA surcharges based on MAGI (using AGI as proxy)
-            magi = total_ira_distribution  # AGI for IRMAA purposes
+            # Taxable account handling
+            # First, grow existing balance
+            taxable_growth = taxable_account * investment_return
+            taxable_account_after_growth = taxable_account * (1 + investment_return)
             
-            if magi <= 206_000:
-                chris_irmaa = base_part_b + base_part_d
-            elif magi <= 258_000:
-                chris_irmaa = (base_part_b + 185 * 12 * 0.40) + (base_part_d + 12.90 * 12)
-            elif magi <= 322_000:
-                chris_irmaa = (base_part_b + 185 * 12 * 1.00) + (base_part_d + 33.30 * 12)
-            elif magi <= 386_000:
-                chris_irmaa = (base_part_b + 185 * 12 * 1.60) + (base_part_d + 53.80 * 12)
-            elif magi <= 750_000:
-                chris_irmaa = (base_part_b + 185 * 12 * 2.20) + (base_part_d + 74.20 * 12)
-            else:
-                chris_irmaa = (base_part_b + 185 * 12 * 2.40) + (base_part_d + 81.00 * 12)
+            # Calculate capital gains tax on the growth
+            # Assume all growth is unrealized gains that get taxed annually at long-term rates
+            capital_gains_tax = taxable_growth * capital_gains_rate
             
-            irmaa_premium += chris_irmaa
-        
-        if mandy_alive and mandy_age >= 65:
-            base_part_b = 185 * 12
-            base_part_d = 35 * 12
-            magi = total_ira_distribution
+            # Reduce taxable account by capital gains tax
+            taxable_account_after_tax = taxable_account_after_growth - capital_gains_tax
             
-            if magi <= 206_000:
-                mandy_irmaa = base_part_b + base_part_d
-            elif magi <= 258_000:
-                mandy_irmaa = (base_part_b + 185 * 12 * 0.40) + (base_part_d + 12.90 * 12)
-            elif magi <= 322_000:
-                mandy_irmaa = (base_part_b + 185 * 12 * 1.00) + (base_part_d + 33.30 * 12)
-            elif magi <= 386_000:
-                mandy_irmaa = (base_part_b + 185 * 12 * 1.60) + (base_part_d + 53.80 * 12)
-            elif magi <= 750_000:
-                mandy_irmaa = (base_part_b + 185 * 12 * 2.20) + (base_part_d + 74.20 * 12)
+            # Then handle surplus/deficit
+            if surplus_or_deficit > 0:
+                # Excess cash goes into taxable account
+                taxable_account = taxable_account_after_tax + surplus_or_deficit
+                taxable_contribution = surplus_or_deficit
+                taxable_withdrawal = 0
+            elif surplus_or_deficit < 0 and taxable_account_after_tax > 0:
+                # Need to withdraw from taxable to cover shortfall
+                taxable_withdrawal = min(abs(surplus_or_deficit), taxable_account_after_tax)
+                taxable_account = taxable_account_after_tax - taxable_withdrawal
+                taxable_contribution = 0
             else:
-                mandy_irmaa = (base_part_b + 185 * 12 * 2.40) + (base_part_d + 81.00 * 12)
+                # No surplus and no taxable account to draw from
+                taxable_account = taxable_account_after_tax
+                taxable_contribution = 0
+                taxable_withdrawal = 0
             
-            irmaa_premium += mandy_irmaa
-        
-        year_data['IRMAA_Premium'] = irmaa_premium
-        
-        # Total IRA distribution
-        # Before Traditional IRA is depleted: all comes from Traditional
-        # After Traditional IRA is depleted: comes from Roth
-        total_ira_distribution = rmd + conversion + additional_withdrawal
-        year_data['Total_IRA_Distribution'] = total_ira_distribution
-        
-        # Update balances
-        # Traditional IRA: grows first, then distributions taken
-        trad_ira_growth = trad_ira * investment_return
-        trad_ira_after_growth = trad_ira * (1 + investment_return)
-        
-        # Check if we have enough in Traditional IRA for all distributions
-        if trad_ira_after_growth >= total_ira_distribution:
-            # All distributions come from Traditional
-            trad_ira = trad_ira_after_growth - total_ira_distribution
-            roth_distribution = 0
-        else:
-            # Traditional IRA gets depleted, remainder comes from Roth
-            trad_distribution = trad_ira_after_growth
-            roth_distribution = total_ira_distribution - trad_ira_after_growth
-            trad_ira = 0
-        
-        # Roth IRA: add conversions, grow, then subtract any distributions
-        roth_ira_growth = (roth_ira + conversion) * investment_return
-        roth_ira = (roth_ira + conversion) * (1 + investment_return) - roth_distribution
-        
-        year_data['Trad_IRA_Growth'] = trad_ira_growth
-        year_data['Trad_IRA_End'] = trad_ira
-        year_data['Roth_Distribution'] = roth_distribution
-        year_data['Roth_IRA_Growth'] = roth_ira_growth
-        year_data['Roth_IRA_End'] = roth_ira
-        
-        # Calculate surplus/deficit
-        # Cash available = SS + RMD + Additional (conversion goes to Roth, not spendable)
-        # Cash needed = Spending + Tax
-        cash_available = total_ss + rmd + additional_withdrawal
-        cash_needed = spending_need + federal_tax
-        surplus_or_deficit = cash_available - cash_needed
-        
-        year_data['Net_Available'] = cash_available
-        year_data['Surplus_Deficit'] = surplus_or_deficit
-        
-        # Taxable account handling
-        # First, grow existing balance
-        taxable_growth = taxable_account * investment_return
-        taxable_account_after_growth = taxable_account * (1 + investment_return)
-        
-        # Calculate capital gains tax on the growth
-        # Assume all growth is unrealized gains that get taxed annually at long-term rates
-        # Long-term capital gains rates for MFJ (2026 estimated):
-        # 0% up to ~$94,050, 15% up to ~$583,750, 20% above
-        # For simplicity, use 15% rate (most will fall in this bracket)
-        capital_gains_rate = 0.15
-        capital_gains_tax = taxable_growth * capital_gains_rate
-        
-        # Reduce taxable account by capital gains tax
-        taxable_account_after_tax = taxable_account_after_growth - capital_gains_tax
-        
-        # Then handle surplus/deficit
-        if surplus_or_deficit > 0:
-            # Excess cash goes into taxable account
-            taxable_account = taxable_account_after_tax + surplus_or_deficit
-            taxable_contribution = surplus_or_deficit
-            taxable_withdrawal = 0
-        elif surplus_or_deficit < 0 and taxable_account_after_tax > 0:
-            # Need to withdraw from taxable to cover shortfall
-            taxable_withdrawal = min(abs(surplus_or_deficit), taxable_account_after_tax)
-            taxable_account = taxable_account_after_tax - taxable_withdrawal
-            taxable_contribution = 0
-        else:
-            # No surplus and no taxable account to draw from
-            taxable_account = taxable_account_after_tax
-            taxable_contribution = 0
-            taxable_withdrawal = 0
-        
-        year_data['Taxable_Growth'] = taxable_growth
-        year_data['Taxable_Cap_Gains_Tax'] = capital_gains_tax
-        year_data['Taxable_Contribution'] = taxable_contribution
-        year_data['Taxable_Withdrawal'] = taxable_withdrawal
-        year_data['Taxable_End'] = taxable_account
-        year_data['Total_Assets_End'] = trad_ira + roth_ira + taxable_account
-        
-        results.append(year_data)
-        
-        year += 1
-        chris_age += 1
-        mandy_age += 1
+            out[s, TAXABLE_GROWTH, t] = taxable_growth
+            out[s, TAXABLE_CAP_GAINS_TAX, t] = capital_gains_tax
+            out[s, TAXABLE_CONTRIBUTION, t] = taxable_contribution
+            out[s, TAXABLE_WITHDRAWAL, t] = taxable_withdrawal
+            out[s, TAXABLE_END, t] = taxable_account
+            out[s, TOTAL_ASSETS_END, t] = trad_ira + roth_ira + taxable_account
+
+def compile_with_numba():
+    """Swap the simulation core and its helpers for numba-compiled versions.
+    
+    Returns False, leaving the plain NumPy/Python versions in place, if numba isn't installed.
+    """
+    global calculate_federal_tax, calculate_ss_taxable, calculate_irmaa, marginal_rate
+    global tax_on_agi, ss_taxable_slope, _simulate_core, numba_compiled
+    if numba_compiled:
+        return True
+    try:
+        from numba import njit, vectorize
+    except ImportError:  # numba is optional
+        return False
     
-    return pd.DataFrame(results)
+    # Helpers are rebound first: numba resolves them as globals when the core compiles
+    calculate_federal_tax = njit(cache=True)(calculate_federal_tax)
+    calculate_ss_taxable = vectorize(['float64(float64, float64)'], cache=True)(calculate_ss_taxable)
+    calculate_irmaa = njit(cache=True)(calculate_irmaa)
+    marginal_rate = njit(cache=True)(marginal_rate)
+    tax_on_agi = njit(cache=True)(tax_on_agi)
+    ss_taxable_slope = njit(cache=True)(ss_taxable_slope)
+    # fastmath minus the no-NaN/no-Inf flags: conversion_plans uses NaN as "no plan"
+    _simulate_core = njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})(_simulate_core)
+    numba_compiled = True
+    return True
 
-# Run both scenarios
-print("Running baseline scenario (no conversions)...")
-baseline_df = run_scenario("Baseline", do_conversions=False)
+def build_schedules():
+    """Per-year schedules shared by every scenario - pure functions of the year index"""
+    
+    # Number of simulated years: until both spouses are past life expectancy
+    n_years = max(chris_life_expectancy - chris_age_2026, mandy_life_expectancy - mandy_age_2026) + 1
+    idx = np.arange(n_years)
+    
+    years = 2026 + idx
+    
+    # Per-spouse state as (n_years, 2) arrays: column 0 is Chris, column 1 is Mandy
+    ages = np.array([chris_age_2026, mandy_age_2026]) + idx[:, None]
+    alive = ages <= np.array([chris_life_expectancy, mandy_life_expectancy])
+    both_alive = alive.all(axis=1)
+    
+    # Standard deduction (reduced once one spouse has died)
+    std_deductions = np.where(both_alive, standard_deduction_2026, standard_deduction_2026 * 0.7)
+    
+    # Social Security
+    ss_start_ages = np.array([ss_start_age_chris, ss_start_age_mandy])
+    ss_annual = np.array([chris_ss_annual, mandy_ss_annual])
+    ss_total = np.where((ages >= ss_start_ages) & alive, ss_annual, 0).sum(axis=1)
+    
+    # Medicare enrollees (living spouses 65+) each pay the same IRMAA-adjusted premium
+    medicare_count = (alive & (ages >= 65)).sum(axis=1)
+    
+    # RMD age is the older living spouse; rates gathered for all years at once
+    rmd_ages = np.where(alive, ages, 0).max(axis=1)
+    rmd_rates = RMD_RATES[rmd_ages]
+    
+    # Spending need (inflated)
+    inflation_factor = (1 + inflation_rate) ** idx
+    spending = annual_spending_need * inflation_factor
+    
+    return {
+        'years': years,
+        'chris_ages': ages[:, 0],
+        'mandy_ages': ages[:, 1],
+        'medicare_count': medicare_count,
+        'std_deductions': std_deductions,
+        'ss_total': ss_total,
+        'rmd_rates': rmd_rates,
+        'spending': spending,
+    }
 
-print("Running conversion scenario (maximize 24% bracket)...")
-conversion_df = run_scenario("With_Conversions", do_conversions=True)
+def optimize_conversions(sched):
+    """Conversion schedule maximizing total final assets, solved as a linear program.
+    
+    Uses a linearized version of the simulation: Social Security is treated as 85%
+    taxable and IRMAA is ignored. As in the simulator, every IRA distribution counts
+    toward AGI, including withdrawals taken from the Roth once the Traditional IRA is
+    empty. Tax is the epigraph of the bracket lines, which is exact because the
+    objective pushes tax down. The returned conversions are meant to be run back
+    through the simulator, which applies the exact rules.
+    
+    Raises ImportError when cvxpy is not installed, and RuntimeError when the solver
+    fails or finds no optimal plan (e.g. spending the savings can't cover).
+    """
+    # Imported here: cvxpy is optional and slow to import
+    import cvxpy as cp
+    
+    n_years = len(sched['years'])
+    r = investment_return
+    ss_total = sched['ss_total']
+    spending = sched['spending']
+    rmd_rates = sched['rmd_rates']
+    std_deductions = sched['std_deductions']
+    
+    # Beginning-of-year balances (plus the final end-of-horizon balance)
+    trad = cp.Variable(n_years + 1, nonneg=True)
+    roth = cp.Variable(n_years + 1, nonneg=True)
+    taxable = cp.Variable(n_years + 1, nonneg=True)
+    # Per-year flows
+    conversion = cp.Variable(n_years, nonneg=True)
+    additional = cp.Variable(n_years, nonneg=True)
+    roth_withdrawal = cp.Variable(n_years, nonneg=True)
+    federal_tax = cp.Variable(n_years, nonneg=True)
+    
+    rmd = cp.multiply(rmd_rates, trad[:-1])
+    agi = rmd + conversion + additional + roth_withdrawal
+    taxable_income = cp.pos(agi + 0.85 * ss_total - std_deductions)
+    surplus = ss_total + rmd + additional + roth_withdrawal - spending - federal_tax
+    
+    constraints = [
+        trad[0] == initial_ira,
+        roth[0] == 0,
+        taxable[0] == 0,
+        trad[1:] == (1 + r) * trad[:-1] - rmd - conversion - additional,
+        roth[1:] == (1 + r) * (roth[:-1] + conversion) - roth_withdrawal,
+        taxable[1:] == (1 + r * (1 - capital_gains_rate)) * taxable[:-1] + surplus,
+    ]
+    for lower, rate, base_tax in zip(bracket_lowers, bracket_rates, bracket_base_tax):
+        constraints.append(federal_tax >= base_tax + rate * (taxable_income - lower))
+    
+    problem = cp.Problem(cp.Maximize(trad[-1] + roth[-1] + taxable[-1]), constraints)
+    try:
+        problem.solve(solver=cp.CLARABEL)
+    except cp.error.SolverError as err:
+        raise RuntimeError(f"Conversion optimization failed: {err}") from err
+    if problem.status != cp.OPTIMAL:
+        raise RuntimeError(f"Conversion optimization failed: {problem.status}")
+    
+    return np.maximum(conversion.value, 0.0)
+
+def run_scenarios(sched, scenario_names, do_conversions, conversion_plans=None, conversion_targets=None):
+    """Run retirement scenarios side by side; returns a dict of column arrays per scenario
+    
+    sched is the build_schedules() output, shared with optimize_conversions.
+    conversion_targets sets the taxable income each converting scenario fills up to
+    (default: top of the 24% bracket). conversion_plans optionally fixes each
+    scenario's yearly conversions (NaN rows fall back to the bracket-filling rule).
+    """
+    n_years = len(sched['years'])
+    if conversion_plans is None:
+        conversion_plans = np.full((len(scenario_names), n_years), np.nan)
+    if conversion_targets is None:
+        conversion_targets = np.full(len(scenario_names), conversion_target_income)
+    
+    # All scenarios share the schedules and run in a single call to the core,
+    # which writes every (scenario, column, year) cell - no need to zero-fill
+    out = np.empty((len(scenario_names), len(OUTPUT_COLUMNS), n_years), dtype=np.float64)
+    do_conversions = np.asarray(do_conversions, dtype=np.bool_)
+    conversion_targets = np.asarray(conversion_targets, dtype=np.float64)
+    conversion_plans = np.asarray(conversion_plans, dtype=np.float64)
+    if out.shape[0] * n_years >= numba_min_scenario_years:
+        compile_with_numba()
+    _simulate_core(do_conversions, conversion_targets, conversion_plans,
+                   sched['chris_ages'], sched['medicare_count'], sched['std_deductions'],
+                   sched['ss_total'], sched['rmd_rates'], sched['spending'], out)
+    
+    # Plain column arrays, in output-sheet order
+    return [
+        {
+            'Year': sched['years'],
+            'Chris_Age': sched['chris_ages'],
+            'Mandy_Age': sched['mandy_ages'],
+            'Scenario': np.full(n_years, scenario_name),
+            **dict(zip(OUTPUT_COLUMNS, scenario_out))
+        }
+        for scenario_name, scenario_out in zip(scenario_names, out)
+    ]
+
+def write_rows_sheet(workbook, sheet_name, header, rows):
+    """Write a header and a sequence of rows to a new worksheet, one row at a time"""
+    worksheet = workbook.add_worksheet(sheet_name)
+    # Bold, bordered, centered header: DataFrame.to_excel's style in pandas 2.x (3.0 dropped it)
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    worksheet.write_row(0, 0, header, header_format)
+    # Rows go out strictly in order, as constant_memory mode requires
+    for row, values in enumerate(rows, start=1):
+        worksheet.write_row(row, 0, values)
+
+def write_columns_sheet(workbook, sheet_name, cols):
+    """Write a dict of column arrays to a new worksheet"""
+    columns = [np.asarray(values).tolist() for values in cols.values()]
+    write_rows_sheet(workbook, sheet_name, list(cols), zip(*columns))
 
-# Combine for comparison
-combined_df = pd.concat([baseline_df, conversion_df], ignore_index=True)
+# Scenarios: no conversions, and conversions filling the 24% bracket
+sched = build_schedules()
+no_plan = np.full(len(sched['years']), np.nan)
+scenario_names = ["Baseline", "With_Conversions"]
+do_conversions = [False, True]
+conversion_targets = [conversion_target_income, conversion_target_income]
+conversion_plans = [no_plan, no_plan]
+
+# Bracket-target sweep: fill to the top of each candidate bracket (12% through 35%).
+# The target matching conversion_target_income is With_Conversions, so it isn't rerun.
+sweep_targets = bracket_lowers[2:]
+sweep_names = [f"Fill_{rate:.0%}_Bracket" for rate in bracket_rates[1:-1]]
+for name, target in zip(sweep_names, sweep_targets):
+    if target != conversion_target_income:
+        scenario_names.append(name)
+        do_conversions.append(True)
+        conversion_targets.append(target)
+        conversion_plans.append(no_plan)
+
+# Optimal conversion schedule from the linear program, when cvxpy is available
+# and the plan is feasible; otherwise the scenario is skipped
+print("Solving for the optimal conversion schedule...")
+try:
+    optimized_plan = optimize_conversions(sched)
+except ImportError:
+    print("  cvxpy is not installed - skipping the optimized conversion scenario")
+    optimized_plan = None
+except RuntimeError as err:
+    print(f"  {err} - skipping the optimized conversion scenario")
+    optimized_plan = None
+
+if optimized_plan is not None:
+    scenario_names.append("Optimized_Conversions")
+    do_conversions.append(False)
+    conversion_targets.append(conversion_target_income)
+    conversion_plans.append(optimized_plan)
+
+# All scenarios run together in a single pass
+print(f"Running {len(scenario_names)} scenarios...")
+results = dict(zip(scenario_names, run_scenarios(sched, scenario_names, do_conversions, conversion_plans, conversion_targets)))
+baseline_cols = results["Baseline"]
+conversion_cols = results["With_Conversions"]
+optimized_cols = results.get("Optimized_Conversions")
+for name, target in zip(sweep_names, sweep_targets):
+    if target == conversion_target_income:
+        results[name] = conversion_cols
+
+# Best bracket target by total final assets
+sweep_final_assets = np.array([results[name]['Total_Assets_End'][-1] for name in sweep_names])
+best_sweep = sweep_names[np.argmax(sweep_final_assets)]
 
 # Save to Excel with multiple sheets
 output_file = '/mnt/user-data/outputs/roth_conversion_analysis.xlsx'
 
-with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+# xlsxwriter in constant_memory mode streams each row to disk as soon as the next one
+# starts instead of holding the whole workbook in memory. That mode drops any cell not
+# written in row order, so every sheet goes through write_rows_sheet rather than
+# DataFrame.to_excel, which writes column by column.
+with pd.ExcelWriter(output_file, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}) as writer:
     # Baseline scenario
-    baseline_df.to_excel(writer, sheet_name='Baseline_No_Conversions', index=False)
+    write_columns_sheet(writer.book, 'Baseline_No_Conversions', baseline_cols)
     
     # Conversion scenario
-    conversion_df.to_excel(writer, sheet_name='With_Conversions', index=False)
+    write_columns_sheet(writer.book, 'With_Conversions', conversion_cols)
+    
+    # Optimized conversion scenario
+    if optimized_cols is not None:
+        write_columns_sheet(writer.book, 'Optimized_Conversions', optimized_cols)
     
     # Summary comparison
     summary_data = []
     
-    for scenario, df in [('Baseline', baseline_df), ('With Conversions', conversion_df)]:
-        total_taxes = df['Federal_Tax'].sum()
-        total_cap_gains = df['Taxable_Cap_Gains_Tax'].sum()
-        total_irmaa = df['IRMAA_Premium'].sum()
-        total_conversions = df['Roth_Conversion'].sum()
-        final_trad = df['Trad_IRA_End'].iloc[-1]
-        final_roth = df['Roth_IRA_End'].iloc[-1]
-        final_taxable = df['Taxable_End'].iloc[-1]
+    summary_scenarios = [('Baseline', baseline_cols), ('With Conversions', conversion_cols)]
+    if optimized_cols is not None:
+        summary_scenarios.append(('Optimized Conversions', optimized_cols))
+    
+    for scenario, cols in summary_scenarios:
+        total_taxes = cols['Federal_Tax'].sum()
+        total_cap_gains = cols['Taxable_Cap_Gains_Tax'].sum()
+        total_irmaa = cols['IRMAA_Premium'].sum()
+        total_conversions = cols['Roth_Conversion'].sum()
+        final_trad = cols['Trad_IRA_End'][-1]
+        final_roth = cols['Roth_IRA_End'][-1]
+        final_taxable = cols['Taxable_End'][-1]
         total_assets = final_trad + final_roth + final_taxable
-        avg_surplus = df['Surplus_Deficit'].mean()
+        avg_surplus = cols['Surplus_Deficit'].mean()
         
         summary_data.append({
             'Scenario': scenario,
@@ -399,30 +633,54 @@ with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
             'Avg_Annual_Surplus': avg_surplus
         })
     
-    summary_df = pd.DataFrame(summary_data)
-    summary_df.to_excel(writer, sheet_name='Summary_Comparison', index=False)
+    # One dict per scenario, written straight out as rows
+    write_rows_sheet(writer.book, 'Summary_Comparison', list(summary_data[0]),
+                     [list(row.values()) for row in summary_data])
+    
+    # Bracket-target sweep
+    sweep_data = {
+        'Scenario': sweep_names,
+        'Target_Taxable_Income': sweep_targets,
+        'Total_Conversions': [results[name]['Roth_Conversion'].sum() for name in sweep_names],
+        'Total_All_Taxes': [
+            results[name]['Federal_Tax'].sum() + results[name]['Taxable_Cap_Gains_Tax'].sum()
+            + results[name]['IRMAA_Premium'].sum()
+            for name in sweep_names
+        ],
+        'Total_Final_Assets': sweep_final_assets
+    }
+    write_columns_sheet(writer.book, 'Bracket_Target_Sweep', sweep_data)
     
-    # Conversion years detail (first 10 years showing conversion activity)
-    conversion_years = conversion_df[conversion_df['Roth_Conversion'] > 0].head(15)
-    if len(conversion_years) > 0:
-        conversion_years.to_excel(writer, sheet_name='Conversion_Years_Detail', index=False)
+    # Conversion years detail (first 15 years showing conversion activity)
+    converting = np.flatnonzero(conversion_cols['Roth_Conversion'] > 0)[:15]
+    if converting.size:
+        conversion_years = {name: values[converting] for name, values in conversion_cols.items()}
+        write_columns_sheet(writer.book, 'Conversion_Years_Detail', conversion_years)
 
 print(f"\nAnalysis complete! File saved to: {output_file}")
 print("\n" + "="*80)
 print("SUMMARY COMPARISON")
 print("="*80)
 
-for scenario, df in [('Baseline (No Conversions)', baseline_df), ('With Roth Conversions', conversion_df)]:
+print_scenarios = [('Baseline (No Conversions)', baseline_cols), ('With Roth Conversions', conversion_cols)]
+if optimized_cols is not None:
+    print_scenarios.append(('Optimized Roth Conversions', optimized_cols))
+
+for scenario, cols in print_scenarios:
     print(f"\n{scenario}:")
-    print(f"  Total Lifetime Income Taxes: ${df['Federal_Tax'].sum():,.0f}")
-    print(f"  Total Capital Gains Taxes: ${df['Taxable_Cap_Gains_Tax'].sum():,.0f}")
-    print(f"  Total IRMAA Premiums: ${df['IRMAA_Premium'].sum():,.0f}")
-    print(f"  Total All Taxes/Premiums: ${df['Federal_Tax'].sum() + df['Taxable_Cap_Gains_Tax'].sum() + df['IRMAA_Premium'].sum():,.0f}")
-    print(f"  Total Roth Conversions: ${df['Roth_Conversion'].sum():,.0f}")
-    print(f"  Final Traditional IRA: ${df['Trad_IRA_End'].iloc[-1]:,.0f}")
-    print(f"  Final Roth IRA: ${df['Roth_IRA_End'].iloc[-1]:,.0f}")
-    print(f"  Final Taxable Account: ${df['Taxable_End'].iloc[-1]:,.0f}")
-    print(f"  Total Final Assets: ${(df['Trad_IRA_End'].iloc[-1] + df['Roth_IRA_End'].iloc[-1] + df['Taxable_End'].iloc[-1]):,.0f}")
-    print(f"  Average Annual Surplus/Deficit: ${df['Surplus_Deficit'].mean():,.0f}")
+    print(f"  Total Lifetime Income Taxes: ${cols['Federal_Tax'].sum():,.0f}")
+    print(f"  Total Capital Gains Taxes: ${cols['Taxable_Cap_Gains_Tax'].sum():,.0f}")
+    print(f"  Total IRMAA Premiums: ${cols['IRMAA_Premium'].sum():,.0f}")
+    print(f"  Total All Taxes/Premiums: ${cols['Federal_Tax'].sum() + cols['Taxable_Cap_Gains_Tax'].sum() + cols['IRMAA_Premium'].sum():,.0f}")
+    print(f"  Total Roth Conversions: ${cols['Roth_Conversion'].sum():,.0f}")
+    print(f"  Final Traditional IRA: ${cols['Trad_IRA_End'][-1]:,.0f}")
+    print(f"  Final Roth IRA: ${cols['Roth_IRA_End'][-1]:,.0f}")
+    print(f"  Final Taxable Account: ${cols['Taxable_End'][-1]:,.0f}")
+    print(f"  Total Final Assets: ${(cols['Trad_IRA_End'][-1] + cols['Roth_IRA_End'][-1] + cols['Taxable_End'][-1]):,.0f}")
+    print(f"  Average Annual Surplus/Deficit: ${cols['Surplus_Deficit'].mean():,.0f}")
+
+print("\nBracket-Target Sweep (Total Final Assets):")
+for name, final_assets in zip(sweep_names, sweep_final_assets):
+    print(f"  {name}: ${final_assets:,.0f}{'  <- best' if name == best_sweep else ''}")
 
 print("\n" + "="*80)